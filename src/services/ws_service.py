@@ -111,6 +111,17 @@ def svc_get_devices(configroot, hutch, alias):
 
     return ok_response(value = xx)
 
+# Return the key for an alias (the highest key for that alias) or for a
+# decimal key passed in as a string.
+def resolve_key(hc, alias):
+    if alias.isdecimal():
+        return int(alias)
+    try:
+        d = hc.find({'alias' : alias}, session=None).sort('key', DESCENDING).limit(1)[0]
+        return d['key']
+    except IndexError:
+        raise NameError("No alias %s!" % alias)
+
 @ws_service_blueprint.route("/<configroot>/get_configuration/<hutch>/<alias>/<device>/", methods=["GET"])
 def svc_get_configuration(configroot, hutch, alias, device):
     """
@@ -121,15 +132,10 @@ def svc_get_configuration(configroot, hutch, alias, device):
     cdb = context.configdbclient.get_database(configroot)
     hc = cdb[hutch]
 
-    if alias.isdecimal():
-        key = int(alias)
-    else:
-        # get key from alias
-        try:
-            d = hc.find({'alias' : alias}, session=None).sort('key', DESCENDING).limit(1)[0]
-            key = d['key']
-        except IndexError:
-            return error_response(msg = "get_configuration: No alias %s!" % alias)
+    try:
+        key = resolve_key(hc, alias)
+    except Exception as ex:
+        return error_response(msg = "get_configuration: %s" % ex)
 
     c = hc.find_one({"key": key})
     if c is None:
@@ -148,6 +154,106 @@ def svc_get_configuration(configroot, hutch, alias, device):
 
     return ok_response(value = r['config'])
 
+# Flatten a typed json config into dot-separated paths, as used by cdict.
+# The ":types:" subtree is skipped; callers flatten it separately.  Lists
+# of dictionaries (arrays of structs) are walked by index, all other lists
+# are kept as single values.
+def flatten_config(cfg, prefix="", out=None):
+    if out is None:
+        out = {}
+    items = enumerate(cfg) if isinstance(cfg, list) else cfg.items()
+    for k, v in items:
+        if k == ":types:":
+            continue
+        p = prefix + str(k)
+        if (isinstance(v, dict) and v) or (isinstance(v, list) and v and
+                                           all(isinstance(x, dict) for x in v)):
+            flatten_config(v, p + ".", out)
+        else:
+            out[p] = v
+    return out
+
+@ws_service_blueprint.route("/<configroot>/diff/<hutch>/", methods=["GET"])
+def svc_diff(configroot, hutch):
+    """
+    Compare two configurations in the specified hutch.
+    Pass in the configurations as the query parameters a and b; each is
+    either an alias or a key. Optionally restrict the comparison to some
+    devices using (one or more) device query parameters.
+    For each device, return the added, removed and changed dot-separated
+    value paths, and under types the paths whose ":types:" entry differs.
+    Arrays of structs are compared element by element, other arrays as a
+    whole. Devices pointing to the same config document are not loaded,
+    and devices with no path-level differences are left out.
+    """
+    aref = request.args.get("a", None)
+    bref = request.args.get("b", None)
+    if not aref or not bref:
+        return error_response(msg = "diff: Please specify the configurations as query parameters a and b")
+    devices = request.args.getlist("device")
+
+    logger.debug("svc_diff: hutch=%s, a=%s, b=%s, devices=%s" % (hutch, aref, bref, devices))
+
+    cdb = context.configdbclient.get_database(configroot)
+    hc = cdb[hutch]
+
+    links = []
+    for ref in (aref, bref):
+        try:
+            key = resolve_key(hc, ref)
+        except Exception as ex:
+            return error_response(msg = "diff: %s" % ex)
+        c = hc.find_one({"key": key}, {"devices": 1})
+        if c is None:
+            return error_response(msg = "diff: No key %s!" % key)
+        links.append((key, {l['device']: l['configs'][0] for l in c["devices"]
+                            if not devices or l['device'] in devices}))
+    (akey, alinks), (bkey, blinks) = links
+
+    missing = [d for d in devices if d not in alinks and d not in blinks]
+    if missing:
+        return error_response(msg = "diff: No device %s in key %s or %s!" % (", ".join(missing), akey, bkey))
+
+    # Only fetch the documents that differ, one query per collection.
+    changed = sorted(d for d in set(alinks) | set(blinks)
+                     if alinks.get(d) != blinks.get(d))
+    wanted = {}
+    for d in changed:
+        for l in (alinks.get(d), blinks.get(d)):
+            if l is not None:
+                wanted.setdefault(l['collection'], set()).add(l['_id'])
+    docs = {}
+    for cname, ids in wanted.items():
+        for r in cdb[cname].find({"_id": {"$in": list(ids)}}):
+            docs[(cname, r['_id'])] = (flatten_config(r['config']),
+                                       flatten_config(r['config'].get(":types:", {})))
+        for i in ids:
+            if (cname, i) not in docs:
+                d = next(d for d in changed for l in (alinks.get(d), blinks.get(d))
+                         if l is not None and l['collection'] == cname and l['_id'] == i)
+                return error_response(msg = "diff: device %s config %s in collection %s does not point to a valid document" % (d, i, cname))
+
+    def paths(l):
+        if l is None:
+            return {}, {}
+        return docs[(l['collection'], l['_id'])]
+
+    xx = {}
+    for d in changed:
+        old, oldtypes = paths(alinks.get(d))
+        new, newtypes = paths(blinks.get(d))
+        dd = {'added':   {p: new[p] for p in new if p not in old},
+              'removed': {p: old[p] for p in old if p not in new},
+              'changed': {p: {'old': old[p], 'new': new[p]}
+                          for p in old if p in new and old[p] != new[p]},
+              'types':   {p: {'old': oldtypes.get(p), 'new': newtypes.get(p)}
+                          for p in set(oldtypes) | set(newtypes)
+                          if oldtypes.get(p) != newtypes.get(p)}}
+        if any(dd.values()):
+            xx[d] = dd
+
+    return ok_response(value = {'a': akey, 'b': bkey, 'devices': xx})
+
 @ws_service_blueprint.route("/<configroot>/print_device_configs/<name>/", methods=["GET"])
 def svc_print_device_configs(configroot, name):
     """